@@ -2,22 +2,111 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from tkinter import filedialog
-from scipy.signal import savgol_filter
+from scipy.signal import savgol_coeffs
+
+# Savitzky-Golay smoothing parameters; the filter weights are computed once here
+window_length = 51  # Adjust this value to control the degree of smoothing
+polyorder = 3  # Polynomial order, adjust as needed
+# Row i evaluates the least-squares polynomial fitted to a window at position i of that window
+savgol_weights = np.stack([savgol_coeffs(window_length, polyorder, pos=i, use='dot') for i in range(window_length)])
+
+def trapezoid_weights(depth):
+    """
+    Returns the trapezoidal rule weights for samples taken at the given depths,
+    so that np.trapz(values, depth) equals values @ trapezoid_weights(depth).
+    """
+    spacing = np.empty_like(depth)
+    spacing[1:-1] = depth[2:] - depth[:-2]
+    spacing[0] = depth[1] - depth[0]
+    spacing[-1] = depth[-1] - depth[-2]
+    return 0.5 * spacing
+
+def savgol_smooth(values):
+    """
+    Smooths the values with the precomputed Savitzky-Golay weights.
+    Matches savgol_filter(values, window_length, polyorder), including its polynomial fit at the edges.
+    """
+    half_window = window_length // 2
+    smoothed = np.convolve(values, savgol_weights[half_window][::-1], mode='same')
+    smoothed[:half_window] = savgol_weights[:half_window] @ values[:window_length]
+    smoothed[-half_window:] = savgol_weights[half_window + 1:] @ values[-window_length:]
+    return smoothed
+
+def pad_add(a, b):
+    """
+    Adds two 1-D arrays of possibly different lengths, treating missing entries as zero.
+    """
+    size = max(a.size, b.size)
+    return np.pad(a, (0, size - a.size)) + np.pad(b, (0, size - b.size))
+
+def read_results_in_chunks(file_path, chunksize=1 << 16, keep_rows=True):
+    """
+    Reads the depth and thickness columns of a results CSV chunk by chunk.
+    The resolution integral, the 100 mm bin sums and counts and the thickness extremes are accumulated per chunk,
+    so memory use is bounded by chunksize when keep_rows is False (e.g. when batch-comparing probes).
+    Rows are assumed to be in ascending depth order, as written by main.py.
+    Returns a DataFrame of all rows (None if keep_rows is False) and a dict of the accumulated results.
+    """
+    reader = pd.read_csv(file_path, engine='c', usecols=['Depth (mm)', 'Thickness (mm)'], dtype={'Depth (mm)': np.float32, 'Thickness (mm)': np.float32}, chunksize=chunksize)
+    chunks = []
+    resolution_integral = 0.0
+    bin_sums = np.zeros(0)
+    bin_counts = np.zeros(0, dtype=np.intp)
+    min_thickness, max_thickness = np.inf, -np.inf
+    first_depth = None
+    last_depth = last_reciprocal = None  # Carried over so the trapezoid joining two chunks is included
+
+    for chunk in reader:
+        # Convert depth from cm to mm
+        chunk['Depth (mm)'] = chunk['Depth (mm)'] * 10
+        if keep_rows:
+            chunks.append(chunk)
+        depth = chunk['Depth (mm)'].to_numpy()
+        thickness = chunk['Thickness (mm)'].to_numpy()
+        reciprocal_thickness = 1 / thickness
+
+        if first_depth is None:
+            first_depth = depth[0]
+        else:
+            depth = np.r_[last_depth, depth]
+            reciprocal_thickness = np.r_[last_reciprocal, reciprocal_thickness]
+        if depth.size > 1:
+            resolution_integral += reciprocal_thickness @ trapezoid_weights(depth)
+        last_depth, last_reciprocal = depth[-1], reciprocal_thickness[-1]
+
+        bin_idx = np.floor((chunk['Depth (mm)'].to_numpy() - first_depth) / 100).astype(np.intp)
+        bin_sums = pad_add(bin_sums, np.bincount(bin_idx, weights=thickness))
+        bin_counts = pad_add(bin_counts, np.bincount(bin_idx))
+        min_thickness = min(min_thickness, thickness.min())
+        max_thickness = max(max_thickness, thickness.max())
+
+    # Depths on the last edge fall outside every bin
+    depth_bins = np.arange(first_depth, last_depth + 100, 100)
+    num_bins = len(depth_bins) - 1
+    bin_sums, bin_counts = bin_sums[:num_bins], bin_counts[:num_bins]
+
+    summary = {
+        'Resolution Integral (R)': resolution_integral,
+        'Depth Bins': depth_bins,
+        'Bin Means': np.divide(bin_sums, bin_counts, out=np.full(num_bins, np.nan), where=bin_counts > 0),
+        'Last Slice Thickness': 1 / last_reciprocal,
+        'Maximum Slice Thickness': max_thickness,
+        'Minimum Slice Thickness': min_thickness,
+    }
+    data = pd.concat(chunks, ignore_index=True) if keep_rows else None
+    return data, summary
 
 # Open file dialog to select CSV file
 root = filedialog.Tk()
 root.withdraw()
 file_path = filedialog.askopenfilename(title="Select CSV file", filetypes=[("CSV files", "*.csv")])
 print(file_path)
-# Read the CSV data
-data = pd.read_csv(file_path)
-
-# Convert depth from cm to mm
-data['Depth (mm)'] = data['Depth (mm)'] * 10
+# Read the CSV data in chunks, accumulating the bin means, resolution integral and extremes on the way
+data, summary = read_results_in_chunks(file_path)
 
 # 1. Slice Thickness vs. Depth Plot
 fig, ax = plt.subplots(figsize=(8, 6))
-ax.errorbar(data['Depth (mm)'], data['Thickness (mm)'], fmt='o-', label='Probe Data')
+ax.plot(data['Depth (mm)'], data['Thickness (mm)'], 'o-', label='Probe Data')
 ax.set_xlabel('Depth (mm)')
 ax.set_ylabel('Slice Thickness (mm)')
 ax.set_title('Slice Thickness    vs. Depth')
@@ -25,11 +114,18 @@ ax.legend()
 
 # Find and plot the slice thickness values at every 10 mm
 target_depths_mm = np.arange(10, int(data['Depth (mm)'].max() + 1), 10)
-for target_depth in target_depths_mm:
-    depth_diff = np.abs(data['Depth (mm)'] - target_depth)
-    nearest_idx = depth_diff.idxmin()
-    thickness_at_target = data.loc[nearest_idx, 'Thickness (mm)']
-    ax.plot(target_depth, thickness_at_target, 'ro', markersize=10, label=f'~{target_depth} mm')
+
+# Look up the nearest measured depth for every target in one sorted search
+depth_values = data['Depth (mm)'].to_numpy()
+thickness_values = data['Thickness (mm)'].to_numpy()
+order = np.argsort(depth_values, kind='stable')
+sorted_depths, sorted_thicknesses = depth_values[order], thickness_values[order]
+right = np.clip(np.searchsorted(sorted_depths, target_depths_mm), 1, len(sorted_depths) - 1)
+left = right - 1
+nearest = np.where(np.abs(sorted_depths[left] - target_depths_mm) <= np.abs(sorted_depths[right] - target_depths_mm), left, right)
+slice_thicknesses = sorted_thicknesses[nearest]
+
+ax.scatter(target_depths_mm, slice_thicknesses, c='r', s=80, zorder=5, label='Every 10 mm')
 
 ax.legend()
 
@@ -38,9 +134,7 @@ depth = data['Depth (mm)'].values
 slice_thickness = data['Thickness (mm)'].values
 
 # Apply Savitzky-Golay filter to smooth the data
-window_length = 51  # Adjust this value to control the degree of smoothing
-polyorder = 3  # Polynomial order, adjust as needed
-smoothed_slice_thickness = savgol_filter(slice_thickness, window_length, polyorder)
+smoothed_slice_thickness = savgol_smooth(slice_thickness)
 
 # Separate plot for smoothed data
 fig_smoothed, ax_smoothed = plt.subplots(figsize=(8, 6))
@@ -52,8 +146,8 @@ ax_smoothed.legend()
 
 # 2. Bar plot of slice thickness every 100 mm
 fig_bar, ax_bar = plt.subplots(figsize=(8, 6))
-depth_bins = np.arange(np.min(data['Depth (mm)']), np.max(data['Depth (mm)']) + 100, 100)
-bin_means = [data['Thickness (mm)'][np.logical_and(data['Depth (mm)'] >= depth_bins[i], data['Depth (mm)'] < depth_bins[i+1])].mean() for i in range(len(depth_bins)-1)]
+depth_bins = summary['Depth Bins']
+bin_means = summary['Bin Means']
 bin_centers = (depth_bins[1:] + depth_bins[:-1]) / 2
 ax_bar.bar(bin_centers, bin_means, width=50)
 ax_bar.set_title('Slice Thickness by 100mm Depth Bins')
@@ -63,18 +157,14 @@ ax_bar.set_ylabel('Slice Thickness (mm)')
 plt.show()
 
 # 3. Resolution Integral Calculation
-depth = data['Depth (mm)'].values
-thickness = data['Thickness (mm)'].values
-reciprocal_thickness = 1 / thickness
-
-# Numerical integration using the trapezoidal rule
-resolution_integral = np.trapz(reciprocal_thickness, depth)
+# Numerical integration using the trapezoidal rule, accumulated while reading
+resolution_integral = summary['Resolution Integral (R)']
 print(f'Resolution Integral (R): {resolution_integral:.2f}')
 
 # 4. Depth of Field (LR) and Characteristic Resolution (DR)
 # Assuming the curve is a rectangular area
 area = resolution_integral
-width = 1 / reciprocal_thickness[-1]  # Minimum slice thickness
+width = summary['Last Slice Thickness']  # Minimum slice thickness
 height = area / width
 depth_of_field = height
 characteristic_resolution = width
@@ -83,12 +173,6 @@ print(f'Depth of Field (LR): {depth_of_field:.2f} mm')
 print(f'Characteristic Resolution (DR): {characteristic_resolution:.2f} mm')
 
 # 5. Probe Comparison Matrix
-slice_thicknesses = []
-for target_depth in target_depths_mm:
-    depth_diff = np.abs(data['Depth (mm)'] - target_depth)
-    nearest_idx = depth_diff.idxmin()
-    slice_thicknesses.append(data.loc[nearest_idx, 'Thickness (mm)'])
-
 probe_metrics = {
     'Resolution Integral (R)': resolution_integral,
     'Depth of Field (LR)': depth_of_field,
@@ -98,8 +182,8 @@ probe_metrics = {
 for i, target_depth in enumerate(target_depths_mm):
     probe_metrics[f'Slice Thickness at ~{target_depth} mm'] = slice_thicknesses[i]
 
-probe_metrics['Maximum Slice Thickness'] = data['Thickness (mm)'].max()
-probe_metrics['Minimum Slice Thickness'] = data['Thickness (mm)'].min()
+probe_metrics['Maximum Slice Thickness'] = summary['Maximum Slice Thickness']
+probe_metrics['Minimum Slice Thickness'] = summary['Minimum Slice Thickness']
 
 print('\nProbe Comparison Matrix:')
 for metric, value in probe_metrics.items():
@@ -13,7 +13,7 @@ This program analyzes a video file to measure the thickness of a sample at diffe
    - Option to enable visualizations
 
 4. Exclusion zone selection (optional): The user can set an exclusion zone at the top of the frame to ignore a specific depth range.
-5. Video analysis: The program will analyze the video frame by frame, preprocess the frames, extract vertical lines, and calculate the thickness for each line.
+5. Video analysis: The program will analyze the video frame by frame, extract grayscale vertical lines, and calculate the thickness for each line.
 6. Results saving: The thickness measurements at different depths are saved in a CSV file.
 7. Results plotting: A plot of thickness vs. depth is displayed.
 8. Log file generation: A log file is created with the user-provided input parameters, settings, and the time taken for video analysis.
@@ -33,20 +33,37 @@ Usage:
 
 import numpy as np
 import cv2
-import csv
+import pandas as pd
 import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import filedialog
 import time
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional; measurements fall back to NumPy
+    NUMBA_AVAILABLE = False
+
+try:
+    import cupy as cp
+    import decord
+    GPU_DECODE_AVAILABLE = True
+except ImportError:  # decord and CuPy are optional; videos are decoded on the CPU with OpenCV
+    GPU_DECODE_AVAILABLE = False
+
+GRAYSCALE_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)  # BGR weights used by cv2.COLOR_BGR2GRAY
+
+# Hidden Tk root shared by the file dialogs
+root = tk.Tk()
+root.withdraw()
+
 def select_video_file():
     """
     Opens a file dialog to select the video file.
     Returns the file path of the selected video file.
     """
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename()
+    file_path = filedialog.askopenfilename(parent=root)
     return file_path
 
 def select_save_location():
@@ -54,9 +71,7 @@ def select_save_location():
     Opens a directory dialog to select the save location.
     Returns the path of the selected directory.
     """
-    root = tk.Tk()
-    root.withdraw()
-    save_location = filedialog.askdirectory()
+    save_location = filedialog.askdirectory(parent=root)
     return save_location
 
 def prompt_user():
@@ -72,124 +87,189 @@ def prompt_user():
     enable_visualizations = input("Do you want to enable visualizations? (y/n): ").lower() == "y"
     return max_depth_mm, frame_interval, desired_interval, use_multiple_lines, enable_visualizations
 
-def preprocess_frame(frame):
+def line_positions(width, num_lines=1, line_separation_percent=0.3):
     """
-    Preprocesses the input frame by converting it to grayscale and applying Gaussian blur.
-    If visualizations are enabled, it displays the preprocessed frame.
-    Returns the preprocessed frame.
+    Calculates the x coordinates of the vertical lines, centred on the middle of the frame.
+    Returns an integer array of length num_lines.
     """
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (1, 1), 0)
-    if enable_visualizations:
-        visualize_frame(blurred, "Preprocessed Frame")
-    return blurred
+    line_separation = int(width * line_separation_percent)
+    middle_x = width // 2
+    return middle_x + (np.arange(num_lines) - num_lines // 2) * line_separation
 
 def extract_vertical_lines(frame, num_lines=1, line_separation_percent=0.3):
     """
-    Extracts vertical lines from the input frame.
+    Extracts vertical lines from the input frame, converting only those columns to grayscale.
     Args:
-        frame: The input frame.
+        frame: The input BGR frame.
         num_lines: The number of vertical lines to extract.
         line_separation_percent: The separation between lines as a percentage of the frame width.
-    Returns a list of vertical line intensity profiles.
+    Returns a (height, num_lines) float32 array with one vertical line intensity profile per column.
     """
-    height, width = frame.shape[:2]
-    line_separation = int(width * line_separation_percent)
-    middle_x = width // 2
-    lines = []
-    for i in range(num_lines):
-        x = middle_x + (i - num_lines // 2) * line_separation
-        line = frame[:, x].copy()
-        lines.append(line)
-    return lines
+    xs = line_positions(frame.shape[1], num_lines, line_separation_percent)
+    return frame[:, xs].astype(np.float32) @ GRAYSCALE_WEIGHTS
 
 def calculate_thickness(intensity_profile, threshold=0.5):
     """
     Calculates the thickness of the sample based on the intensity profile.
     Args:
-        intensity_profile: The intensity profile of a vertical line.
+        intensity_profile: The intensity profile of a vertical line, a (height, num_lines) array with one profile per column,
+            or a (num_frames, height, num_lines) batch of such arrays.
         threshold: The threshold for determining the thickness boundaries.
-    Returns the calculated thickness.
+    Returns the calculated thickness (one per profile for multi-dimensional input).
+    The thickness is the length of the first run of samples at or above the threshold; a run that reaches the end of the profile is measured up to the end.
     """
-    max_intensity = np.max(intensity_profile)
-    half_max = max_intensity * threshold
-    thickness = 0
-    in_peak = False
-    for i in range(len(intensity_profile)):
-        if intensity_profile[i] >= half_max and not in_peak:
-            start = i
-            in_peak = True
-        elif intensity_profile[i] < half_max and in_peak:
-            end = i
-            thickness = end - start
-            in_peak = False
+    intensity_profile = np.asarray(intensity_profile)
+    axis = max(intensity_profile.ndim - 2, 0)  # The height axis
+    max_intensity = intensity_profile.max(axis=axis)
+    above = intensity_profile >= np.expand_dims(max_intensity, axis) * threshold
+    start = above.argmax(axis=axis)
+    past_peak = np.logical_or.accumulate(above, axis=axis) & ~above  # Below the threshold after the first rise
+    end = np.where(past_peak.any(axis=axis), past_peak.argmax(axis=axis), above.shape[axis])
+    thickness = np.where(max_intensity > 0, end - start, 0)  # Blank profiles have no thickness
+    if thickness.ndim == 0:
+        return int(thickness)
     return thickness
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _measure_lines_kernel(vertical_lines, threshold):
+        """
+        Compiled equivalent of calculate_thickness for a (num_frames, height, num_lines) batch.
+        Each profile is read twice: once for its maximum, then up to the end of its first peak.
+        """
+        num_frames, height, num_lines = vertical_lines.shape
+        thicknesses = np.zeros((num_frames, num_lines), np.int64)
+        for n in prange(num_frames * num_lines):
+            f, k = n // num_lines, n % num_lines
+            max_intensity = 0.0
+            for y in range(height):
+                if vertical_lines[f, y, k] > max_intensity:
+                    max_intensity = vertical_lines[f, y, k]
+            if max_intensity == 0:
+                continue
+            half_max = max_intensity * threshold
+            start = -1
+            end = height
+            for y in range(height):
+                if vertical_lines[f, y, k] >= half_max:
+                    if start < 0:
+                        start = y
+                elif start >= 0:
+                    end = y
+                    break
+            thicknesses[f, k] = end - start
+        return thicknesses
+
+    def measure_line_thicknesses(vertical_lines, threshold=0.5):
+        """
+        Calculates the thickness along each vertical line of a (num_frames, height, num_lines) batch.
+        Returns a (num_frames, num_lines) array of thicknesses.
+        """
+        return _measure_lines_kernel(vertical_lines, threshold)
+else:  # Chosen once here so the analysis loop never checks for Numba
+    measure_line_thicknesses = calculate_thickness
+
 def visualize_frame(frame, title="Original Frame"):
     """
-    Displays the input frame with the given title.
-    If visualizations are not enabled, this function does nothing.
+    Displays the input frame with the given title and waits for a key press.
     """
-    if enable_visualizations:
-        cv2.imshow(title, frame)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+    cv2.imshow(title, frame)
+    cv2.waitKey(0)
+    cv2.destroyAllWindows()
 
-def visualize_vertical_lines(frame, vertical_lines, line_thickness=1):
+def skip_visualization(vertical_lines, depths, thicknesses):
     """
-    Displays the input frame with vertical lines overlaid.
-    If visualizations are not enabled, this function does nothing.
+    Visualization callback used when visualizations are disabled; does nothing.
     """
-    if enable_visualizations:
-        height, width = frame.shape[:2]
-        line_colors = [(0, 255, 0), (0, 0, 255), (255, 0, 0)]  # Green, Blue, Red
-        for i, line in enumerate(vertical_lines):
-            middle_x = width // 2 + (i - len(vertical_lines) // 2) * line_thickness
-            cv2.line(frame, (middle_x, 0), (middle_x, height - 1), line_colors[i % len(line_colors)], line_thickness)
-        visualize_frame(frame, "Vertical Lines")
-
-def visualize_intensity_profiles(vertical_lines):
+
+def create_live_plot(num_lines, height):
     """
-    Displays the intensity profiles of the vertical lines.
-    If visualizations are not enabled, this function does nothing.
+    Creates a single persistent figure showing the current intensity profiles and the thicknesses measured so far.
+    Returns an update function that redraws the existing artists rather than creating a new figure for every frame.
     """
-    if enable_visualizations:
-        fig, axs = plt.subplots(len(vertical_lines), 1, figsize=(8, 6 * len(vertical_lines)), squeeze=False)
-        for i, line in enumerate(vertical_lines):
-            axs[i, 0].plot(line)
-            axs[i, 0].set_title(f"Intensity Profile (Line {i+1})")
-        plt.tight_layout()
-        plt.show()
-
-def visualize_intensity_profile(frame, vertical_lines, line_thicknesses, depth, line_separation_percent=0.1):
+    fig, (ax_profiles, ax_thickness) = plt.subplots(2, 1, figsize=(8, 10))
+    pixel_indices = np.arange(height)
+    profile_lines = [ax_profiles.plot([], [], label=f"Line {i+1}")[0] for i in range(num_lines)]
+    ax_profiles.set_xlim(0, height)
+    ax_profiles.set_ylim(0, 255)
+    ax_profiles.set_xlabel('Pixel')
+    ax_profiles.set_ylabel('Intensity')
+    ax_profiles.set_title('Intensity Profiles')
+    ax_profiles.legend()
+    thickness_line, = ax_thickness.plot([], [], 'o-')
+    ax_thickness.set_xlabel('Depth (mm)')
+    ax_thickness.set_ylabel('Thickness (pixels)')
+    ax_thickness.set_title('Thickness vs. Depth')
+    plt.tight_layout()
+    plt.show(block=False)
+
+    def update(vertical_lines, depths, thicknesses):
+        for profile_line, profile in zip(profile_lines, vertical_lines.T):
+            profile_line.set_data(pixel_indices, profile)
+        thickness_line.set_data(depths, thicknesses)
+        ax_thickness.relim()
+        ax_thickness.autoscale_view()
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+
+    return update
+
+def read_line_batches(video, frame_interval, max_frame_num, num_lines, line_separation_percent, batch_size):
     """
-    Displays the input frame with vertical lines and their thicknesses overlaid.
-    If visualizations are not enabled, this function does nothing.
+    Decodes the video sequentially on the CPU and extracts the vertical lines of every frame_interval-th frame.
+    Yields (frame_nums, vertical_lines) for each batch of up to batch_size sampled frames, with vertical_lines
+    as a (num_frames, height, num_lines) float32 array. The yielded arrays are reused for the next batch.
     """
-    if enable_visualizations:
-        height, width = frame.shape[:2]
-        line_colors = [(0, 255, 0), (0, 0, 255), (255, 0, 0)]  # Green, Blue, Red
-        line_thickness = max(1, min(height // 100, width // 100))
-        line_separation = int(width * line_separation_percent)
-
-        for i, line in enumerate(vertical_lines):
-            middle_x = width // 2 + (i - len(vertical_lines) // 2) * line_separation
-            thickness = line_thicknesses[i]
-            top_boundary = max(0, height // 2 - thickness // 2)
-            bottom_boundary = min(height - 1, height // 2 + thickness // 2)
-            start_point = (middle_x, top_boundary)
-            end_point = (middle_x, bottom_boundary)
-            cv2.line(frame, start_point, end_point, line_colors[i % len(line_colors)], line_thickness)
-            cv2.putText(frame, f"Thickness: {thickness:.2f}", (middle_x + 10, top_boundary + 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, line_colors[i % len(line_colors)], 1)
-
-        # Draw a line to indicate the slice depth
-        slice_depth_y = int(height * (1 - depth / max_depth))
-        cv2.line(frame, (0, slice_depth_y), (width - 1, slice_depth_y), (255, 255, 255), 2)
-        cv2.putText(frame, f"Depth: {depth:.2f} cm", (10, slice_depth_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-
-        visualize_frame(frame, "Intensity Profile")
-
-def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=0.5, line_separation_percent=0.1, top_threshold_pixels=0):
+    height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    batch_lines = np.empty((batch_size, height, num_lines), dtype=np.float32)
+    batch_frame_nums = np.empty(batch_size, dtype=np.intp)
+    batch_count = 0
+
+    # Decode sequentially; seeking to every sampled frame re-decodes from the nearest keyframe
+    video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for frame_num in range(max_frame_num):
+        if frame_num % frame_interval:
+            if not video.grab():  # Advance without decoding into an image
+                break
+            continue
+
+        success, frame = video.read()
+        if not success:
+            break
+
+        batch_lines[batch_count] = extract_vertical_lines(frame, num_lines=num_lines, line_separation_percent=line_separation_percent)
+        batch_frame_nums[batch_count] = frame_num
+        batch_count += 1
+
+        if batch_count == batch_size:
+            yield batch_frame_nums, batch_lines
+            batch_count = 0
+
+    if batch_count:  # The last, partially filled batch
+        yield batch_frame_nums[:batch_count], batch_lines[:batch_count]
+
+def read_line_batches_gpu(video_path, frame_interval, max_frame_num, num_lines, line_separation_percent, batch_size):
+    """
+    Decodes the sampled frames on the GPU with decord (NVDEC) and converts only the vertical lines to grayscale there,
+    so just the (num_frames, height, num_lines) lines are copied back to the host.
+    Raises an exception straight away if decord was built without CUDA support or no GPU is available.
+    Returns a generator yielding the same batches as read_line_batches.
+    """
+    reader = decord.VideoReader(video_path, ctx=decord.gpu(0))
+    frame_nums = np.arange(0, min(max_frame_num, len(reader)), frame_interval)
+    xs = cp.asarray(line_positions(reader[0].shape[1], num_lines, line_separation_percent))
+    weights = cp.asarray(GRAYSCALE_WEIGHTS[::-1])  # decord returns RGB frames
+
+    def batches():
+        for start in range(0, frame_nums.size, batch_size):
+            batch_frame_nums = frame_nums[start:start + batch_size]
+            frames = cp.from_dlpack(reader.get_batch(batch_frame_nums.tolist()).to_dlpack())
+            vertical_lines = frames[:, :, xs].astype(cp.float32) @ weights
+            yield batch_frame_nums, cp.asnumpy(vertical_lines)
+
+    return batches()
+
+def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=0.5, line_separation_percent=0.1, top_threshold_pixels=0, visualize=skip_visualization, batch_size=32):
     """
     Analyzes the video file and calculates the thickness of the sample at different depths.
     Args:
@@ -200,7 +280,10 @@ def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=
         threshold: The threshold for determining the thickness boundaries.
         line_separation_percent: The separation between lines as a percentage of the frame width.
         top_threshold_pixels: The number of pixels to exclude from the top of the frame.
-    Returns the depths, corresponding thicknesses, analysis time, and total vertical pixels as lists.
+        visualize: Callback run after each batch of frames, either skip_visualization or the update function from create_live_plot.
+        batch_size: The number of sampled frames whose lines are measured together.
+    Frames are decoded on the GPU when decord and CuPy are available, otherwise on the CPU with OpenCV.
+    Returns the depths, corresponding thicknesses, analysis time, and total vertical pixels, with depths and thicknesses as arrays.
     """
     start_time = time.time()  # Start timer
 
@@ -209,10 +292,14 @@ def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=
     fps = video.get(cv2.CAP_PROP_FPS)
     height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
-    depths = []
-    thicknesses = []
     max_frame_num = frame_count  # Use the total number of frames
 
+    # Preallocate one slot per sampled frame; frames without a valid measurement are trimmed off at the end
+    max_measurements = max_frame_num // frame_interval + 1
+    depths = np.empty(max_measurements)
+    thicknesses = np.empty(max_measurements)
+    num_measurements = 0
+
     if use_exclusion_zone:
         # Display the first frame and prompt for exclusion zone
         video.set(cv2.CAP_PROP_POS_FRAMES, 0)
@@ -221,7 +308,8 @@ def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=
             frame_with_lines = frame.copy()
             for y in range(25, height, 25):
                 cv2.line(frame_with_lines, (0, y), (frame_with_lines.shape[1], y), (0, 255, 0), 1)
-            visualize_frame(frame_with_lines, "Exclusion Zone Selection")
+            if enable_visualizations:
+                visualize_frame(frame_with_lines, "Exclusion Zone Selection")
 
             exclusion_zone_depth = float(input(f"Enter the desired exclusion zone depth (in pixels, max {height}): "))
             while exclusion_zone_depth < 0 or exclusion_zone_depth > height:
@@ -229,7 +317,8 @@ def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=
 
             frame_with_exclusion = frame.copy()
             cv2.line(frame_with_exclusion, (0, int(exclusion_zone_depth)), (frame_with_exclusion.shape[1], int(exclusion_zone_depth)), (0, 0, 255), 2)
-            visualize_frame(frame_with_exclusion, "Exclusion Zone Preview")
+            if enable_visualizations:
+                visualize_frame(frame_with_exclusion, "Exclusion Zone Preview")
 
             top_threshold_pixels = int(exclusion_zone_depth)
             total_pixels = frame_height - top_threshold_pixels
@@ -238,40 +327,31 @@ def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=
 
     depth_increment = max_depth / frame_count  # Increment in depth per frame
 
-    for frame_num in range(0, max_frame_num, frame_interval):
-        video.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        success, frame = video.read()
-
-        if not success:
-            continue
-
-        if enable_visualizations:
-            visualize_frame(frame, "Original Frame")
-
-        preprocessed_frame = preprocess_frame(frame)
-
+    line_batches = None
+    if GPU_DECODE_AVAILABLE:
+        try:
+            line_batches = read_line_batches_gpu(video_path, frame_interval, max_frame_num, num_lines, line_separation_percent, batch_size)
+        except Exception as error:  # decord without CUDA support, or no GPU
+            print(f"GPU decoding unavailable ({error}); decoding on the CPU.")
+    if line_batches is None:
+        line_batches = read_line_batches(video, frame_interval, max_frame_num, num_lines, line_separation_percent, batch_size)
+
+    # The lines of the sampled frames are measured batch_size frames at a time
+    for batch_frame_nums, vertical_lines in line_batches:
         # Apply top threshold
-        preprocessed_frame[:top_threshold_pixels, :] = 0
+        vertical_lines[:, :top_threshold_pixels] = 0
 
-        vertical_lines = extract_vertical_lines(preprocessed_frame, num_lines=num_lines, line_separation_percent=line_separation_percent)
-        if enable_visualizations:
-            visualize_vertical_lines(frame, vertical_lines)
-            visualize_intensity_profiles(vertical_lines)
+        line_thicknesses = measure_line_thicknesses(vertical_lines, threshold)
+        valid_counts = np.count_nonzero(line_thicknesses, axis=1)  # Skip zero values
+        measured = valid_counts > 0  # Frames with valid measurements
+        avg_thicknesses = line_thicknesses.sum(axis=1)[measured] / valid_counts[measured]
 
-        line_thicknesses = []
-        for line in vertical_lines:
-            thickness = calculate_thickness(line, threshold)
-            if thickness > 0:  # Skip zero values
-                line_thicknesses.append(thickness)
+        end = num_measurements + avg_thicknesses.size
+        depths[num_measurements:end] = batch_frame_nums[measured] * depth_increment  # Depth from frame number and depth increment
+        thicknesses[num_measurements:end] = avg_thicknesses
+        num_measurements = end
 
-        if line_thicknesses:  # Check if there are valid measurements
-            avg_thickness = sum(line_thicknesses) / len(line_thicknesses)
-            depth = frame_num * depth_increment  # Calculate depth based on frame number and depth increment
-            depths.append(depth)
-            thicknesses.append(avg_thickness)
-
-            if enable_visualizations:
-                visualize_intensity_profile(frame, vertical_lines, line_thicknesses, depth, line_separation_percent)
+        visualize(vertical_lines[-1], depths[:num_measurements], thicknesses[:num_measurements])
 
     video.release()
     cv2.destroyAllWindows()
@@ -279,7 +359,7 @@ def analyze_video(video_path, frame_interval, max_depth, num_lines=1, threshold=
     end_time = time.time()  # End timer
     analysis_time = end_time - start_time  # Calculate analysis time
 
-    return depths, thicknesses, analysis_time, total_pixels
+    return depths[:num_measurements], thicknesses[:num_measurements], analysis_time, total_pixels
 
 # Main code
 video_path = select_video_file()
@@ -298,26 +378,26 @@ use_exclusion_zone = input("Do you want to set an exclusion zone? (y/n): ").lowe
 
 if use_multiple_lines:
     num_lines = int(input("Enter the number of lines to use (e.g., 3, 5): "))
-    # Analyze the video with multiple lines
-    depths, thicknesses, analysis_time, total_pixels = analyze_video(video_path, frame_interval, max_depth_mm, num_lines, threshold=0.5, line_separation_percent=0.1, top_threshold_pixels=top_threshold_pixels if use_exclusion_zone else 0)
 else:
-    # Analyze the video with a single line
-    depths, thicknesses, analysis_time, total_pixels = analyze_video(video_path, frame_interval, max_depth_mm, 1, threshold=0.5, line_separation_percent=0.1, top_threshold_pixels=top_threshold_pixels if use_exclusion_zone else 0)
+    num_lines = 1
+
+# Choose the visualization callback once; the analysis loop never checks enable_visualizations
+visualize = create_live_plot(num_lines, frame_height) if enable_visualizations else skip_visualization
+
+depths, thicknesses, analysis_time, total_pixels = analyze_video(video_path, frame_interval, max_depth_mm, num_lines, threshold=0.5, line_separation_percent=0.1, top_threshold_pixels=top_threshold_pixels if use_exclusion_zone else 0, visualize=visualize)
 
 # Calculate the pixel-to-mm ratio
 pixel_to_mm_ratio = max_depth_mm / total_pixels
 
 # Convert thicknesses from pixels to millimeters
-thicknesses_mm = [thickness * pixel_to_mm_ratio for thickness in thicknesses]
+thicknesses_mm = thicknesses * pixel_to_mm_ratio
 
 # Save the results to a CSV file
 timestamp = time.strftime("%Y%m%d_%H%M%S")
 csv_filename = f"{save_location}/results_{timestamp}.csv"
-with open(csv_filename, "w", newline="") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(["Depth (mm)", "Thickness (pixels)", "Thickness (mm)"])
-    for depth, thickness, thickness_mm in zip(depths, thicknesses, thicknesses_mm):
-        writer.writerow([depth, thickness, thickness_mm])
+results = pd.DataFrame({"Depth (mm)": depths, "Thickness (pixels)": thicknesses, "Thickness (mm)": thicknesses_mm})
+with open(csv_filename, "w", newline="", buffering=1 << 20) as csvfile:  # Large buffer so the file is written in a few chunks
+    results.to_csv(csvfile, index=False)
 
 print(f"Results saved to {csv_filename}")
 
@@ -331,18 +411,21 @@ plt.show()
 
 # Write log file
 log_file_name = f"results_{timestamp}_log.txt"
+log_text = (
+    f"Maximum Depth: {max_depth_mm / 10} cm ({max_depth_mm} mm)\n"
+    f"Frame Interval: {frame_interval}\n"
+    f"Desired Interval: {desired_interval} mm\n"
+    f"Use Multiple Lines: {use_multiple_lines}\n"
+    f"Number of Lines: {num_lines if use_multiple_lines else 1}\n"
+    f"Use Exclusion Zone: {use_exclusion_zone}\n"
+    f"Enable Visualizations: {enable_visualizations}\n"
+    f"Time to Analyze Video and Calculate Thicknesses: {analysis_time:.2f} seconds\n"
+    "\n"
+    f"Number of Vertical Pixels = {total_pixels}\n"
+    f"Max Depth (mm) = {max_depth_mm}\n"
+    f"Pixel to MM Ratio = {pixel_to_mm_ratio:.6f}\n"
+)
 with open(f"{save_location}/{log_file_name}", "w") as log_file:
-    log_file.write(f"Maximum Depth: {max_depth_mm / 10} cm ({max_depth_mm} mm)\n")
-    log_file.write(f"Frame Interval: {frame_interval}\n")
-    log_file.write(f"Desired Interval: {desired_interval} mm\n")
-    log_file.write(f"Use Multiple Lines: {use_multiple_lines}\n")
-    log_file.write(f"Number of Lines: {num_lines if use_multiple_lines else 1}\n")
-    log_file.write(f"Use Exclusion Zone: {use_exclusion_zone}\n")
-    log_file.write(f"Enable Visualizations: {enable_visualizations}\n")
-    log_file.write(f"Time to Analyze Video and Calculate Thicknesses: {analysis_time:.2f} seconds\n")
-    log_file.write("\n")
-    log_file.write(f"Number of Vertical Pixels = {total_pixels}\n")
-    log_file.write(f"Max Depth (mm) = {max_depth_mm}\n")
-    log_file.write(f"Pixel to MM Ratio = {pixel_to_mm_ratio:.6f}\n")
+    log_file.write(log_text)
 
 print(f"Log file saved as {save_location}/{log_file_name}")